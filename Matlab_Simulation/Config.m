@@ -4,6 +4,7 @@ rng(4);
 dt = 0.01;          % Time step
 maxIter = 50e3;     % Maximum iteration
 animation = 1;      % Live Animation Flag. 0:off/ 1:on
+verbose = 1;        % Print the Lyapunov value every iteration. 0:off/ 1:on
 
 %% Parameter Config
 
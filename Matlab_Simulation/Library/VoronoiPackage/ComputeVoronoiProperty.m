@@ -1,7 +1,11 @@
 %% This function returns ...
-%
-function [Info] = ComputeVoronoiProperty(pointCoord, CVTCoord, verList, verPtr)
+% - @[computePartialCVT]: (optional, default true) compute the 2x2 partial derivatives of the CVTs.
+%   Callers that only need the Lyapunov gradient skip them and use Calc_CVT_PD_L with the partition masses
+function [Info] = ComputeVoronoiProperty(pointCoord, CVTCoord, verList, verPtr, computePartialCVT)
     format long;
+    if(nargin < 5)
+        computePartialCVT = true;
+    end
     nAgent = numel(verPtr);
     
     %% Assign the computed Voronoi and instantiate the Data Structure that contains all neccessary Coverage Information
@@ -34,6 +38,10 @@ function [Info] = ComputeVoronoiProperty(pointCoord, CVTCoord, verList, verPtr)
         PartialCVTComputation_Struct.my.Coord = Info.AgentReport(thisAgent).MyInfo.Coord;
         PartialCVTComputation_Struct.my.CVTCoord =  Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.CVTCoord;
         PartialCVTComputation_Struct.my.PartionMass = ComputePartitionMass(Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.VertexesCoord);
+        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.PartitionMass = PartialCVTComputation_Struct.my.PartionMass;
+        if(~computePartialCVT)
+            continue;
+        end
        
         %% Scan over the friend list of each agent to compute the Voronoi properties
         ownParitialDerivative = zeros(2,2);
@@ -46,36 +54,18 @@ function [Info] = ComputeVoronoiProperty(pointCoord, CVTCoord, verList, verPtr)
             
                 [tmpdCidZi, adjacentPartialDerivative] = ComputePartialDerivativeCVTs(PartialCVTComputation_Struct);
                 ownParitialDerivative = ownParitialDerivative + tmpdCidZi;
-                Info.AgentReport(thisAgent).FriendAgentInfo(friendAgent).VoronoiInfo.partialCVT.dCx_dVMFriend_x =  adjacentPartialDerivative(1, 1);
-                Info.AgentReport(thisAgent).FriendAgentInfo(friendAgent).VoronoiInfo.partialCVT.dCx_dVMFriend_y =  adjacentPartialDerivative(1, 2);
-                Info.AgentReport(thisAgent).FriendAgentInfo(friendAgent).VoronoiInfo.partialCVT.dCy_dVMFriend_x =  adjacentPartialDerivative(2, 1);
-                Info.AgentReport(thisAgent).FriendAgentInfo(friendAgent).VoronoiInfo.partialCVT.dCy_dVMFriend_y =  adjacentPartialDerivative(2, 2);
+                % Kept as a 2x2 matrix so that the controller uses it without reassembling
+                Info.AgentReport(thisAgent).FriendAgentInfo(friendAgent).VoronoiInfo.partialCVT.dC_dVMFriend = adjacentPartialDerivative;
             end 
         end
 
-        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCx_dVMx = ownParitialDerivative(1, 1);
-        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCx_dVMy = ownParitialDerivative(1, 2);
-        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCy_dVMx = ownParitialDerivative(2, 1);
-        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCy_dVMy = ownParitialDerivative(2, 2);
+        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dC_dVM = ownParitialDerivative;
     end    
 end
 
 %% Compute the mass of Voronoi partition
 function [mOmega] = ComputePartitionMass(vertexCoord)
-        IntDomain = struct('type','polygon','x',vertexCoord.x(:)','y',vertexCoord.y(:)');
-        param = struct('method','gauss','points',6); 
-        %param = struct('method','dblquad','tol',1e-6);
-        %% The total mass of the region
-        func = @(x,y) 1;
-        mOmega = doubleintegral(func, IntDomain, param);
-        
-        %% The density over X axis
-        %denseFuncX = @(x,y) x;
-        %denseX = doubleintegral(denseFuncX, IntDomain, param);
-        
-        %% The density over Y axis
-        %denseFuncY = @(x,y) y;
-        %denseY = doubleintegral(denseFuncY, IntDomain, param);
+        mOmega = Voronoi2D_calcPartitionMass([vertexCoord.x(:), vertexCoord.y(:)]);
 end
 
 function [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(PartialCVTComputation_Struct)
@@ -87,47 +77,13 @@ function [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(PartialCVTC
     vertex1 = PartialCVTComputation_Struct.Common.Vertex1;
     vertex2 = PartialCVTComputation_Struct.Common.Vertex2;
 
-    %% Function definition for partial derivative
-    % rho = @(x,y) 1;
-    distanceZiZj = sqrt((thisCoord.x - adjCoord.x)^2 + (thisCoord.y - adjCoord.y)^2);
-    dq__dZix_n = @(qX, ziX) (qX - ziX) / distanceZiZj; %        ((zjX - ziX)/2 + (qX - (qXY + zjX)/2)) / distanceZiZj; 
-    dq__dZiy_n = @(qY, ziY) (qY - ziY) / distanceZiZj; %        ((zjY - ziY)/2 + (qY - (ziY + zjY)/2)) /distanceZiZj; 
-    dq__dZjx_n = @(qX, zjX) (zjX - qX) / distanceZiZj; %        ((zjX - ziX)/2 - (qX - (ziX + zjX)/2)) /distanceZiZj; 
-    dq__dZjy_n = @(qY, zjY) (zjY - qY) / distanceZiZj; %        ((zjY - ziY)/2 - (qY - (ziY + zjY)/2))/distanceZiZj; 
-    
-    
-    
-    %% Integration parameter: t: 0 -> 1
-    XtoT = @(t) vertex1.x + (vertex2.x - vertex1.x)* t;
-    YtoT = @(t) vertex1.y + (vertex2.y - vertex1.y)* t;
-    % Factorization of dq = param * dt for line integration
-    dqTodtParam = sqrt((vertex2.x - vertex1.x)^2 + (vertex2.y - vertex1.y)^2);  
-    
-    %% dCi_dzix
-    dCi_dzix_secondTermInt = integral(@(t) dq__dZix_n(XtoT(t), thisCoord.x) * dqTodtParam , 0, 1);
-    dCix_dzix = (integral(@(t) XtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.x) / mVi;
-    dCiy_dzix = (integral(@(t) YtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.y) / mVi;
-    
-    %% dCi_dziy
-    dCi_dziy_secondTermInt = integral(@(t) dq__dZiy_n(YtoT(t), thisCoord.y) * dqTodtParam , 0, 1);
-    dCix_dziy = (integral(@(t) XtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.x) / mVi;
-    dCiy_dziy = (integral(@(t) YtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.y) / mVi;
-    
-    %% dCi_dzjx
-    dCi_dzjx_secondTermInt = integral(@(t) dq__dZjx_n(XtoT(t), adjCoord.x) * dqTodtParam , 0, 1 );
-    dCix_dzjx = (integral(@(t) XtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.x) / mVi;
-    dCiy_dzjx = (integral(@(t) YtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.y) / mVi;
-    
-    %% dCi_dzjy
-    dCi_dzjy_secondTermInt = integral(@(t) dq__dZjy_n(YtoT(t), adjCoord.y) * dqTodtParam , 0, 1 );
-    dCix_dzjy =  (integral(@(t) XtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.x) / mVi;
-    dCiy_dzjy =  (integral(@(t) YtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.y) / mVi;
-    
-    %% Return
-    dCi_dzi_AdjacentJ   = [ dCix_dzix, dCix_dziy; 
-                            dCiy_dzix, dCiy_dziy];
-    dCi_dzj             = [ dCix_dzjx, dCix_dzjy ;
-                            dCiy_dzjx, dCiy_dzjy];   
+    %% Closed-form line integrals are shared with the decentralized computation
+    [dCi_dzi_AdjacentJ, dCi_dzj] = Voronoi2D_calCVTPartialDerivative([thisCoord.x; thisCoord.y], ...
+                                                                     [thisCVT.x; thisCVT.y], ...
+                                                                     mVi, ...
+                                                                     [adjCoord.x; adjCoord.y], ...
+                                                                     [vertex1.x; vertex1.y], ...
+                                                                     [vertex2.x; vertex2.y]);
 end
 
 
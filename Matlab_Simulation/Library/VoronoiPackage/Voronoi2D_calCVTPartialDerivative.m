@@ -1,4 +1,5 @@
 function [dCi_dzi_AdjacentJ, dCi_dzj] = Voronoi2D_calCVTPartialDerivative(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2d, vertex1_2d, vertex2_2d)
+%#codegen
     % Parse the struct
 %     mVi = PartialCVTComputation_Struct.my.PartionMass;
 %     thisCoord_2d = PartialCVTComputation_Struct.my.Coord;
@@ -9,61 +10,31 @@ function [dCi_dzi_AdjacentJ, dCi_dzj] = Voronoi2D_calCVTPartialDerivative(thisCo
 
     %% Function definition for partial derivative
     % rho = @(x,y) 1;
-    distanceZiZj = sqrt((thisCoord_2d(1) - adjCoord_2d(1))^2 + (thisCoord_2d(2) - adjCoord_2d(2))^2);
-    dq__dZix_n = @(qX, ziX) (qX - ziX) / distanceZiZj; %        ((zjX - ziX)/2 + (qX - (qXY + zjX)/2)) / distanceZiZj; 
-    dq__dZiy_n = @(qY, ziY) (qY - ziY) / distanceZiZj; %        ((zjY - ziY)/2 + (qY - (ziY + zjY)/2)) /distanceZiZj; 
-    dq__dZjx_n = @(qX, zjX) (zjX - qX) / distanceZiZj; %        ((zjX - ziX)/2 - (qX - (ziX + zjX)/2)) /distanceZiZj; 
-    dq__dZjy_n = @(qY, zjY) (zjY - qY) / distanceZiZj; %        ((zjY - ziY)/2 - (qY - (ziY + zjY)/2))/distanceZiZj; 
-    
-    
+    % dq__dZix_n = (qX - ziX) / distanceZiZj;
+    % dq__dZiy_n = (qY - ziY) / distanceZiZj;
+    % dq__dZjx_n = (zjX - qX) / distanceZiZj;
+    % dq__dZjy_n = (zjY - qY) / distanceZiZj;
+    distanceZiZj = hypot(thisCoord_2d(1) - adjCoord_2d(1), thisCoord_2d(2) - adjCoord_2d(2));
     
     %% Integration parameter: t: 0 -> 1
-    XtoT = @(t) vertex1_2d(1) + (vertex2_2d(1) - vertex1_2d(1))* t;
-    YtoT = @(t) vertex1_2d(2) + (vertex2_2d(2) - vertex1_2d(2))* t;
+    % q(t) = v1 + (v2 - v1) * t is linear in t, so every integrand below is
+    % a polynomial of degree <= 2 in t and is integrated in closed form.
+    v1_2d = vertex1_2d(:);
+    v2_2d = vertex2_2d(:);
     % Factorization of dq = param * dt for line integration
-    dqTodtParam = sqrt((vertex2_2d(1) - vertex1_2d(1))^2 + (vertex2_2d(2) - vertex1_2d(2))^2);  
-    
-    %% dCi_dzix
-    dCi_dzix_secondTermInt = integral(@(t) dq__dZix_n(XtoT(t), thisCoord_2d(1)) * dqTodtParam , 0, 1);
-    dCix_dzix = (integral(@(t) XtoT(t) .* dq__dZix_n(XtoT(t), thisCoord_2d(1)) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT_2d(1)) / mVi;
-    dCiy_dzix = (integral(@(t) YtoT(t) .* dq__dZix_n(XtoT(t), thisCoord_2d(1)) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT_2d(2)) / mVi;
-    
-    %% dCi_dziy
-    dCi_dziy_secondTermInt = integral(@(t) dq__dZiy_n(YtoT(t), thisCoord_2d(2)) * dqTodtParam , 0, 1);
-    dCix_dziy = (integral(@(t) XtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord_2d(2)) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT_2d(1)) / mVi;
-    dCiy_dziy = (integral(@(t) YtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord_2d(2)) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT_2d(2)) / mVi;
+    dqTodtParam = hypot(v2_2d(1) - v1_2d(1), v2_2d(2) - v1_2d(2));
+    % Common factor of all integrals: dq / dt, normal scaling and CVT mass
+    intParam = dqTodtParam / distanceZiZj / mVi;
     
-    %% dCi_dzjx
-    dCi_dzjx_secondTermInt = integral(@(t) dq__dZjx_n(XtoT(t), adjCoord_2d(1)) * dqTodtParam , 0, 1 );
-    dCix_dzjx = (integral(@(t) XtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord_2d(1)) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT_2d(1)) / mVi;
-    dCiy_dzjx = (integral(@(t) YtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord_2d(1)) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT_2d(2)) / mVi;
-    
-    %% dCi_dzjy
-    dCi_dzjy_secondTermInt = integral(@(t) dq__dZjy_n(YtoT(t), adjCoord_2d(2)) * dqTodtParam , 0, 1 );
-    dCix_dzjy =  (integral(@(t) XtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord_2d(2)) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT_2d(1)) / mVi;
-    dCiy_dzjy =  (integral(@(t) YtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord_2d(2)) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT_2d(2)) / mVi;
+    %% Exact moments of the edge, shared by all 12 integrals
+    % intQ = int_0^1 q dt, intQQ = int_0^1 q * q' dt
+    intQ = (v1_2d + v2_2d) / 2;
+    intQQ = (2 * (v1_2d * v1_2d') + v1_2d * v2_2d' + v2_2d * v1_2d' + 2 * (v2_2d * v2_2d')) / 6;
     
     %% Return
-    dCi_dzi_AdjacentJ   = [ dCix_dzix, dCix_dziy; 
-                            dCiy_dzix, dCiy_dziy];
-    dCi_dzj             = [ dCix_dzjx, dCix_dzjy ;
-                            dCiy_dzjx, dCiy_dzjy];   
-end
-
-%% Compute the mass of Voronoi partition
-function [mOmega] = ComputePartitionMass(vertexCoord)
-        IntDomain = struct('type','polygon','x',vertexCoord.x(:)','y',vertexCoord.y(:)');
-        param = struct('method','gauss','points',6); 
-        %param = struct('method','dblquad','tol',1e-6);
-        %% The total mass of the region
-        func = @(x,y) 1;
-        mOmega = doubleintegral(func, IntDomain, param);
-        
-        %% The density over X axis
-        %denseFuncX = @(x,y) x;
-        %denseX = doubleintegral(denseFuncX, IntDomain, param);
-        
-        %% The density over Y axis
-        %denseFuncY = @(x,y) y;
-        %denseY = doubleintegral(denseFuncY, IntDomain, param);
+    % Entry (a, b) of dCi_dzi: int q_a * dq__dZib_n - Ci_a * int dq__dZib_n, i.e.
+    %   dCi_dzi = intQQ - intQ * zi' - Ci * (intQ - zi)'
+    %   dCi_dzj = intQ * zj' - intQQ - Ci * (zj - intQ)'
+    dCi_dzi_AdjacentJ   = (intQQ - intQ * thisCoord_2d(:)' - thisCVT_2d(:) * (intQ - thisCoord_2d(:))') * intParam;
+    dCi_dzj             = (intQ * adjCoord_2d(:)' - intQQ - thisCVT_2d(:) * (adjCoord_2d(:) - intQ)') * intParam;
 end
@@ -0,0 +1,33 @@
+function [dCi_dzi_AdjacentJ, dCi_dzj] = Voronoi2D_calCVTPartialDerivative_Batch(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2xN, vertex1_2xN, vertex2_2xN)
+%#codegen
+    % Batched version of Voronoi2D_calCVTPartialDerivative over all N
+    % Voronoi neighbors of one agent.
+    %   - adjCoord_2xN: each column is the coordinate of one neighbor
+    %   - vertex1_2xN, vertex2_2xN: each column is one vertex of the common edge
+    %   - dCi_dzi_AdjacentJ, dCi_dzj: 2x2xN, page n belongs to neighbor n
+    nNeighbor = size(adjCoord_2xN, 2);
+
+    %% Function definition for partial derivative
+    distanceZiZj = hypot(thisCoord_2d(1) - adjCoord_2xN(1,:), thisCoord_2d(2) - adjCoord_2xN(2,:));
+    % Factorization of dq = param * dt for line integration
+    dqTodtParam = hypot(vertex2_2xN(1,:) - vertex1_2xN(1,:), vertex2_2xN(2,:) - vertex1_2xN(2,:));
+    % Common factor of all integrals: dq / dt, normal scaling and CVT mass
+    intParam = reshape(dqTodtParam ./ distanceZiZj / mVi, 1, 1, nNeighbor);
+
+    %% Exact moments of each edge (see Voronoi2D_calCVTPartialDerivative)
+    % Column (2x1xN) and row (1x2xN) views, outer products by implicit expansion
+    v1_c = reshape(vertex1_2xN, 2, 1, nNeighbor);
+    v1_r = reshape(vertex1_2xN, 1, 2, nNeighbor);
+    v2_c = reshape(vertex2_2xN, 2, 1, nNeighbor);
+    v2_r = reshape(vertex2_2xN, 1, 2, nNeighbor);
+    intQ_c = (v1_c + v2_c) / 2;
+    intQ_r = (v1_r + v2_r) / 2;
+    intQQ = (2 * (v1_c .* v1_r) + v1_c .* v2_r + v2_c .* v1_r + 2 * (v2_c .* v2_r)) / 6;
+
+    %% Return
+    zi_r = reshape(thisCoord_2d, 1, 2);
+    zj_r = reshape(adjCoord_2xN, 1, 2, nNeighbor);
+    Ci_c = reshape(thisCVT_2d, 2, 1);
+    dCi_dzi_AdjacentJ   = (intQQ - intQ_c .* zi_r - Ci_c .* (intQ_r - zi_r)) .* intParam;
+    dCi_dzj             = (intQ_c .* zj_r - intQQ - Ci_c .* (zj_r - intQ_r)) .* intParam;
+end
@@ -1,8 +1,13 @@
 function [mOmega] = Voronoi2D_calcPartitionMass(vertexCoord)
-    IntDomain = struct('type','polygon','x',vertexCoord(:,1)','y',vertexCoord(:,2)');
-        param = struct('method','gauss','points',6); 
-        %param = struct('method','dblquad','tol',1e-6);
-        %% The total mass of the region
-        func = @(x,y) 1; % This is the distribution
-        mOmega = doubleintegral(func, IntDomain, param);
+%#codegen
+    % The density is constant over a polygon, so the mass is its area and
+    % follows in closed form from the shoelace formula. Each row of
+    % vertexCoord is one vertex in perimeter order; a repeated closing
+    % vertex adds a zero term.
+    x = vertexCoord(:,1);
+    y = vertexCoord(:,2);
+    xNext = [x(2:end); x(1)];
+    yNext = [y(2:end); y(1)];
+    %% The total mass of the region
+    mOmega = abs(sum(x.*yNext - xNext.*y)) / 2;
 end
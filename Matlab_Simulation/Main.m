@@ -1,9 +1,12 @@
 %% Adding path
-addpath(genpath('./Library/'));
-addpath(genpath('./Source/'));
+% Resolved from the location of this file so the simulation can be started from any folder
+rootDir = fileparts(mfilename('fullpath'));
+addpath(genpath(fullfile(rootDir, 'Library')));
+addpath(genpath(fullfile(rootDir, 'Source')));
 
 %% Load User Setup Parameters
-clear all; 
+% Only the workspace is cleared, functions that are already parsed stay loaded between runs
+clear; 
 close all;
 Config
        
@@ -94,5 +97,7 @@ for iteration = 1: SIM_PARAM.MAX_ITER
             end
         end
     end    
-    fprintf("Decentralized. Iter: %d. L: %f \n", iteration, sum(Vk_List));
+    if(verbose)
+        fprintf("Decentralized. Iter: %d. L: %f \n", iteration, sum(Vk_List));
+    end
 end
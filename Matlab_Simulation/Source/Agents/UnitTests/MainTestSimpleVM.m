@@ -1,13 +1,8 @@
-addpath(genpath('./Source/Agents'));
-addpath(genpath('./Source/Controller'));
-addpath(genpath('./Source/DataStructure'));
-addpath(genpath('./Source/Tools'));
-addpath(genpath('./Source/Algorithm'));
-addpath(genpath('./Library'));
-addpath(genpath('./Source/Coverage'));
-addpath(genpath('./Source'));
+rootDir = fullfile(fileparts(mfilename('fullpath')), '..', '..', '..');
+addpath(genpath(fullfile(rootDir, 'Library')));
+addpath(genpath(fullfile(rootDir, 'Source')));
 
-clear all; close all;
+clear; close all;
 
 format long;
 SIM_PARAM = SimulationParameter();
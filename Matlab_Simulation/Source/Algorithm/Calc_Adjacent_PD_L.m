@@ -1,15 +1,13 @@
 function [dVidzk] = Calc_Adjacent_PD_L(i_zi_2x1, i_Ci_2x1, i_dCi_dzk_2x2 , i_Q_2x2, i_aj_nx2, i_bj_n)
+%#codegen
     %Computation of the partial derivative of th edesigned Lyapunov
     %function
     %% Assertion
     
     %% Computation
-    hij_func = @(zi_2x1, aj_2x1, bj_1) bj_1 - aj_2x1' * zi_2x1;
-
-    
-    dVidzk = zeros(2,1);
-    for j = 1: size(i_bj_n) 
-        dVidzk = dVidzk + (-i_dCi_dzk_2x2' * i_Q_2x2 * (i_zi_2x1 - i_Ci_2x1)) / hij_func(i_zi_2x1, i_aj_nx2(j,:)', i_bj_n(j));
-    end 
+    % The numerator does not depend on the half-plane, so it is computed once
+    % and scaled by sum(1 / hij), hij = bj - aj' * zi
+    hij = i_bj_n(:) - i_aj_nx2 * i_zi_2x1;
+    dVidzk = -(i_dCi_dzk_2x2' * (i_Q_2x2 * (i_zi_2x1 - i_Ci_2x1))) * sum(1 ./ hij);
 end
 
@@ -0,0 +1,28 @@
+function [dCidzi_w_2x1, dVidzj_2xN] = Calc_CVT_PD_L(i_zi_2x1, i_Ci_2x1, i_mVi, i_zj_2xN, i_v1_2xN, i_v2_2xN, i_w_2x1)
+%#codegen
+    %Contribution of the CVT partial derivatives to the partial derivative
+    %of the Lyapunov function of agent i, computed from the closed-form
+    %edge moments (see Voronoi2D_calCVTPartialDerivative) without forming
+    %the 2x2 matrices dCi_dzi and dCi_dzj of each neighbor.
+    %   - i_zj_2xN, i_v1_2xN, i_v2_2xN: one column per Voronoi neighbor j
+    %   - i_w_2x1: Q * (zi - Ci) * sum(1 / hi)
+    %   - dCidzi_w_2x1: sum over j of dCi_dzi' * w
+    %   - dVidzj_2xN: column j is -dCi_dzj' * w
+
+    %% Computation
+    % Common factor of each edge: dq / dt, normal scaling and CVT mass
+    dqTodtParam = hypot(i_v2_2xN(1,:) - i_v1_2xN(1,:), i_v2_2xN(2,:) - i_v1_2xN(2,:));
+    distanceZiZj = hypot(i_zi_2x1(1) - i_zj_2xN(1,:), i_zi_2x1(2) - i_zj_2xN(2,:));
+    intParam = dqTodtParam ./ distanceZiZj / i_mVi;
+
+    % Edge moments projected on w: intQ' * w, intQQ * w and Ci' * w
+    v1_w = i_w_2x1' * i_v1_2xN;
+    v2_w = i_w_2x1' * i_v2_2xN;
+    intQ = (i_v1_2xN + i_v2_2xN) / 2;
+    intQ_w = (v1_w + v2_w) / 2;
+    intQQ_w = (i_v1_2xN .* (2 * v1_w + v2_w) + i_v2_2xN .* (v1_w + 2 * v2_w)) / 6;
+    Ci_w = i_Ci_2x1' * i_w_2x1;
+
+    dCidzi_w_2x1 = sum((intQQ_w - i_zi_2x1 .* intQ_w - (intQ - i_zi_2x1) * Ci_w) .* intParam, 2);
+    dVidzj_2xN = (intQQ_w - i_zj_2xN .* intQ_w + (i_zj_2xN - intQ) * Ci_w) .* intParam;
+end
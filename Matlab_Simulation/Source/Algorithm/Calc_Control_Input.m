@@ -0,0 +1,13 @@
+function [wOut] = Calc_Control_Input(i_w0, i_theta, i_dVdz_2xN, i_gamma, i_eps)
+%#codegen
+    % Compute the angular velocity of the unicycle from the gradient of the
+    % Lyapunov function and the current orientation
+    %   w = w0 + gamma * w0 * sigmoid(dVdz' * [cos(theta); sin(theta)])
+    %   sigmoid(x) = x / (|x| + eps)
+    % Several agents are computed at once if i_w0 and i_theta are 1xN (or
+    % scalar) and each column of i_dVdz_2xN belongs to one agent
+    %% Computation
+    dotProd = i_dVdz_2xN(1,:) .* cos(i_theta) + i_dVdz_2xN(2,:) .* sin(i_theta);
+    wOut = i_w0 + i_gamma * i_w0 .* dotProd ./ (abs(dotProd) + i_eps);
+end
+
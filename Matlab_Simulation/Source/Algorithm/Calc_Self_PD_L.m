@@ -1,21 +1,18 @@
 function [Vk, dVkdzk] = Calc_Self_PD_L(i_zk_2x1, i_Ck_2x1, i_dCk_dzk_2x2 , i_Q_2x2, i_aj_nx2, i_bj_n)
+%#codegen
     % Compute the self partial derivative of the designed Lyapunov function
     %% Assertion
     
 
     %% Computation
-    normQ_func = @(vec2x1, Q2x2) sqrt(vec2x1' * Q2x2 * vec2x1);
-    hkj_func = @(zk_2x1, aj_2x1, bj_1) bj_1 - aj_2x1' * zk_2x1;
-    Vj_k_func = @(zk_2x1, Ck_2x1, Q, hj_k) normQ_func(zk_2x1 - Ck_2x1, Q)^2 / hj_k / 2;
-    Vk = 0;
-    dVkdzk = zeros(2,1);
-    
-    for j = 1: size(i_bj_n)
-        hj_k = hkj_func(i_zk_2x1, i_aj_nx2(j,:)', i_bj_n(j));
-        assert(hj_k >= 0, 'Controller Fault. Voronoi generator left the interior of the region');
-        Vj_k = Vj_k_func(i_zk_2x1, i_Ck_2x1, i_Q_2x2, hj_k);
-        Vk = Vk + Vj_k;
-        dVkdzk = dVkdzk + ((eye(2) - i_dCk_dzk_2x2') * i_Q_2x2 * (i_zk_2x1 - i_Ck_2x1) + i_aj_nx2(j,:)' * Vj_k) / hj_k;
-    end    
+    % All half-planes are evaluated at once: hj_k = bj - aj' * zk
+    hj_k = i_bj_n(:) - i_aj_nx2 * i_zk_2x1;
+    assert(all(hj_k >= 0), 'Controller Fault. Voronoi generator left the interior of the region');
+    % Q * (zk - Ck) is shared by the Q-norm and the gradient
+    zDiff = i_zk_2x1 - i_Ck_2x1;
+    Q_zDiff = i_Q_2x2 * zDiff;
+    Vj_k = zDiff' * Q_zDiff ./ hj_k / 2;
+    Vk = sum(Vj_k);
+    dVkdzk = (Q_zDiff - i_dCk_dzk_2x2' * Q_zDiff) * sum(1 ./ hj_k) + i_aj_nx2' * (Vj_k ./ hj_k);
 end
 
@@ -51,20 +51,19 @@ classdef BLFController < CoverageControllerBase
 %             end
             
             %% Aggregate the Lyapunov feedback from neighbor agents
-            obj.Local_dVkdzi_List = Struct_Neighbor_CVT_PD_Extended.empty(numel(voronoiCom.rxPartialDerivativeInfo), 0);
-            dV_Accum_Adjacent_Term = zeros(2,1);
-            for i = 1: numel(voronoiCom.rxPartialDerivativeInfo)
+            nNeighbor = numel(voronoiCom.rxPartialDerivativeInfo);
+            obj.Local_dVkdzi_List = Struct_Neighbor_CVT_PD_Extended.empty(nNeighbor, 0);
+            dV_dAdj_2xN = zeros(2, nNeighbor);
+            for i = 1: nNeighbor
                 [~, ~, zi, Ci, dCidzk_2x2] = voronoiCom.rxPartialDerivativeInfo{i}.getValue();
-                [tmp_dV_dAdj] = Calc_Adjacent_PD_L(zi, Ci, dCidzk_2x2 ,obj.controlParam.Q2x2, obj.regionParam.BOUNDARIES_COEFF(:,1:2), obj.regionParam.BOUNDARIES_COEFF(:,3));
-                dV_Accum_Adjacent_Term = dV_Accum_Adjacent_Term + tmp_dV_dAdj;    
-                obj.Local_dVkdzi_List(i) = Struct_Neighbor_CVT_PD_Extended(voronoiCom.rxPartialDerivativeInfo{i}, tmp_dV_dAdj);
+                dV_dAdj_2xN(:,i) = Calc_Adjacent_PD_L(zi, Ci, dCidzk_2x2 ,obj.controlParam.Q2x2, obj.regionParam.BOUNDARIES_COEFF(:,1:2), obj.regionParam.BOUNDARIES_COEFF(:,3));
+                obj.Local_dVkdzi_List(i) = Struct_Neighbor_CVT_PD_Extended(voronoiCom.rxPartialDerivativeInfo{i}, dV_dAdj_2xN(:,i));
             end
-            dV_dzk_total =  obj.dVkdzk + dV_Accum_Adjacent_Term;
+            % One reduction over all neighbor terms
+            dV_dzk_total =  obj.dVkdzk + sum(dV_dAdj_2xN, 2);
             
-            %% Adjustable variable --> Will move later to constant
-            sigmoid_func = @(x,eps) x / (abs(x) + eps);              
             %% Compute the control policy
-            wOut = obj.controlParam.W_ORBIT + obj.controlParam.GAMMA * obj.controlParam.W_ORBIT * sigmoid_func(dV_dzk_total' * [cos(curPose(3)) ;sin(curPose(3))], obj.controlParam.EPS_SIGMOID); 
+            wOut = Calc_Control_Input(obj.controlParam.W_ORBIT, curPose(3), dV_dzk_total, obj.controlParam.GAMMA, obj.controlParam.EPS_SIGMOID); 
             %wOut = obj.w;
             %% Logging out
             Vk = obj.Vk;
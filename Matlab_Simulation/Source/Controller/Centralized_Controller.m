@@ -85,84 +85,89 @@ classdef Centralized_Controller < handle
             end
            
             %% Update the partial derivative of each cells and construct the broadcased information matrix
-            Info = ComputeVoronoiProperty(newPoseVM_2D, poseCVT_2D, v, c);
+            % The 2x2 partial derivatives of the CVTs are not formed, Calc_CVT_PD_L works on the edge moments directly
+            Info = ComputeVoronoiProperty(newPoseVM_2D, poseCVT_2D, v, c, false);
 
             %% Update the Lyapunov state 
             for thisAgent = 1: Info.Common.nAgent
                 %% One shot computation before scanning over the adjacent matrix
-                Ck = [Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.CVTCoord.x, Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.CVTCoord.y]';
-                zk = [Info.AgentReport(thisAgent).MyInfo.Coord.x, Info.AgentReport(thisAgent).MyInfo.Coord.y]';
-                sum_1_div_Hj = 0;
-                sum_aj_HjSquared = 0;
-                for j = 1: size(obj.boundariesCoeff)
-                    hj = (obj.boundariesCoeff(j,3)- (obj.boundariesCoeff(j,1)*zk(1) + obj.boundariesCoeff(j,2)*zk(2))); 
-                    sum_1_div_Hj = sum_1_div_Hj + 1/hj;
-                    sum_aj_HjSquared = sum_aj_HjSquared + [obj.boundariesCoeff(j,1); obj.boundariesCoeff(j,2)] / hj^2 / 2; 
-                end
-                Q_zDiff_div_hj = obj.Q_2x2 * (zk - Ck) * sum_1_div_Hj;
+                Ck = [Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.CVTCoord.x; Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.CVTCoord.y];
+                zk = [Info.AgentReport(thisAgent).MyInfo.Coord.x; Info.AgentReport(thisAgent).MyInfo.Coord.y];
+                % Distance to all half-planes at once: hj = bj - aj' * zk
+                hj = obj.boundariesCoeff(:,3) - obj.boundariesCoeff(:,1:2) * zk;
+                sum_1_div_Hj = sum(1 ./ hj);
+                sum_aj_HjSquared = obj.boundariesCoeff(:,1:2)' * (1 ./ hj.^2) / 2;
+                % Q * (zk - Ck) and the Q-norm are shared by Vk, dVk/dzk and all neighbors
+                zDiff = zk - Ck;
+                Q_zDiff = obj.Q_2x2 * zDiff;
+                zDiff_Q_zDiff = zDiff' * Q_zDiff;
+                Q_zDiff_div_hj = Q_zDiff * sum_1_div_Hj;
                  
-                %% Compute the Partial dVi_dzi of itself
-                dCi_dzi = [Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCx_dVMx, Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCx_dVMy;
-                           Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCy_dVMx, Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.partialCVT.dCy_dVMy];
+                %% Collect the geometry of the adjacent agents, one column per neighbor
+                FriendInfoList = Info.AgentReport(thisAgent).FriendAgentInfo;
+                neighborID_List = find([FriendInfoList.isVoronoiNeighbor]);
+                neighborID_List(neighborID_List == thisAgent) = [];
+                nNeighbor = numel(neighborID_List);
+                zi_2xN = zeros(2, nNeighbor);
+                v1_2xN = zeros(2, nNeighbor);
+                v2_2xN = zeros(2, nNeighbor);
+                for i = 1: nNeighbor
+                    FriendInfo = FriendInfoList(neighborID_List(i));
+                    zi_2xN(:,i) = [FriendInfo.Coord.x; FriendInfo.Coord.y];
+                    v1_2xN(:,i) = [FriendInfo.VoronoiInfo.CommonVertex.Vertex1.x; FriendInfo.VoronoiInfo.CommonVertex.Vertex1.y];
+                    v2_2xN(:,i) = [FriendInfo.VoronoiInfo.CommonVertex.Vertex2.x; FriendInfo.VoronoiInfo.CommonVertex.Vertex2.y];
+                end
+                
+                %% Partial derivatives of the CVT projected on the Lyapunov gradient of this agent and all neighbors
+                [dCk_dzk_Q_zDiff_div_hj, dVkdzi_2xN] = Calc_CVT_PD_L(zk, Ck, ...
+                                                        Info.AgentReport(thisAgent).MyInfo.VoronoiInfo.PartitionMass, ...
+                                                        zi_2xN, v1_2xN, v2_2xN, Q_zDiff_div_hj);
                 
-                Vk = (zk - Ck)' * obj.Q_2x2 * (zk - Ck) * sum_1_div_Hj / 2;
+                Vk = zDiff_Q_zDiff * sum_1_div_Hj / 2;
                 %% If Vk >= 0, the state constraint is already violated. Assert
                 assert(Vk >= 0);
                 V_BLF_List(thisAgent) = Vk;
                 
-                dVkdzk = (eye(2) - dCi_dzi')*Q_zDiff_div_hj + sum_aj_HjSquared * (zk - Ck)' * obj.Q_2x2 * (zk - Ck);
+                dVkdzk = Q_zDiff_div_hj - dCk_dzk_Q_zDiff_div_hj + sum_aj_HjSquared * zDiff_Q_zDiff;
                 % Assign to the Info handle
                 Info.AgentReport(thisAgent).MyInfo.LyapunovState.V = Vk;
                 Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.x = dVkdzk(1);
                 Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.y = dVkdzk(2);
                
-                %% Scan over the adjacent list and compute the corresponding partial derivative
-                for friendID = 1: Info.Common.nAgent
-                    FriendInfo = Info.AgentReport(thisAgent).FriendAgentInfo(friendID);
-                    isNeighbor = (friendID ~= thisAgent) && FriendInfo.isVoronoiNeighbor; 
-                    if(isNeighbor)
-                        dCi_dzk = [FriendInfo.VoronoiInfo.partialCVT.dCx_dVMFriend_x, FriendInfo.VoronoiInfo.partialCVT.dCx_dVMFriend_y;
-                                   FriendInfo.VoronoiInfo.partialCVT.dCy_dVMFriend_x, FriendInfo.VoronoiInfo.partialCVT.dCy_dVMFriend_y];
-                        dVkdzi = -dCi_dzk' * Q_zDiff_div_hj;
-                        % Assign the new adjacent partial derivative
-                        Info.AgentReport(thisAgent).FriendAgentInfo(friendID).LyapunovState.dV_dVMFriend.x = dVkdzi(1);
-                        Info.AgentReport(thisAgent).FriendAgentInfo(friendID).LyapunovState.dV_dVMFriend.y = dVkdzi(2);
-                    end
+                %% Assign the adjacent partial derivatives
+                for i = 1: nNeighbor
+                    Info.AgentReport(thisAgent).FriendAgentInfo(neighborID_List(i)).LyapunovState.dV_dVMFriend.x = dVkdzi_2xN(1,i);
+                    Info.AgentReport(thisAgent).FriendAgentInfo(neighborID_List(i)).LyapunovState.dV_dVMFriend.y = dVkdzi_2xN(2,i);
                 end
             end
             
             %% Compute the Lyapunov partial derivative for each agents
+            % Lyapunov gradient of all agents, one column per agent
+            dVk_2xN = zeros(2, obj.nAgent);
             for thisAgent = 1: Info.Common.nAgent
                 % Initialize the Lyapunov Gradient of itself
-                sumdVi_dzkx = Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.x;     % Note that the adjacent agent affects this agent, so the index is dVj/dVi <--> obj.CoverageStateInfo(Agent_J, Agent_I, :)
-                sumdVi_dzky = Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.y;
+                % Note that the adjacent agent affects this agent, so the index is dVj/dVi <--> obj.CoverageStateInfo(Agent_J, Agent_I, :)
+                sumdVi_dzk = [Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.x; Info.AgentReport(thisAgent).MyInfo.LyapunovState.dV_dVM.y];
                 for friendID = 1 : Info.Common.nAgent
                     % If the considering cell affects us, add it to the
                     % gradient dV_k
                     isNeighbor = (friendID ~= thisAgent) && Info.AgentReport(thisAgent).FriendAgentInfo(friendID).isVoronoiNeighbor; 
                     if(isNeighbor)
                         % NOTE: The index is reverse here according to the control law
-                        sumdVi_dzkx = sumdVi_dzkx + Info.AgentReport(friendID).FriendAgentInfo(thisAgent).LyapunovState.dV_dVMFriend.x;
-                        sumdVi_dzky = sumdVi_dzky + Info.AgentReport(friendID).FriendAgentInfo(thisAgent).LyapunovState.dV_dVMFriend.y; 
+                        dV_dVMFriend = Info.AgentReport(friendID).FriendAgentInfo(thisAgent).LyapunovState.dV_dVMFriend;
+                        sumdVi_dzk = sumdVi_dzk + [dV_dVMFriend.x; dV_dVMFriend.y];
                     end
                 end
-                Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.x = sumdVi_dzkx;
-                Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.y = sumdVi_dzky;
+                dVk_2xN(:, thisAgent) = sumdVi_dzk;
+                Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.x = sumdVi_dzk(1);
+                Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.y = sumdVi_dzk(2);
             end
             
             %% Compute the control output
-            %% Adjustable variable
-            sigmoid_func = @(x,eps) x / (abs(x) + eps);  
-            
-            %% Compute the control policy
-            ControlInput = zeros(obj.nAgent, 1);
+            %% Compute the control policy of all agents at once
+            % curPose_3D(:,3): Actual Orientation
+            ControlInput = Calc_Control_Input(wOrbitList(:)', curPose_3D(:,3)', dVk_2xN, obj.P, obj.EPS_SIGMOID)';
             for thisAgent = 1 : obj.nAgent
-                w0 = wOrbitList(thisAgent);
-                cosTheta = cos(curPose_3D(thisAgent,3));   % agentStatus.curPose(3): Actual Orientation
-                sinTheta = sin(curPose_3D(thisAgent,3)); 
-                dVkx = Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.x;
-                dVky = Info.AgentReport(thisAgent).MyInfo.LyapunovState.dVk.y;
-                ControlInput(thisAgent) = w0 + obj.P * w0 * sigmoid_func(dVkx * cosTheta + dVky * sinTheta, obj.EPS_SIGMOID); 
                 Info.AgentReport(thisAgent).MyInfo.ControlInput.w = ControlInput(thisAgent);
             end
         end
@@ -12,11 +12,9 @@ classdef VMSimpleCoverageController < CoverageControllerBase
             [Vk, ~] = Calc_Self_PD_L(...
                 voronoiCom.GeneratorCoord_2d, voronoiCom.CVTCoord_2d, voronoiCom.dCkdzk , obj.controlParam.Q2x2, obj.regionParam.BOUNDARIES_COEFF(:,1:2), obj.regionParam.BOUNDARIES_COEFF(:,3));         
             assert(Vk >= 0);
-            sigmoid_func = @(x,eps) x / (abs(x) + eps);  
             dZC = voronoiCom.GeneratorCoord_2d - voronoiCom.CVTCoord_2d;
-            dotProd = dZC' * [cos(curPose(3)) ;sin(curPose(3))];
-            wOut =   obj.controlParam.W_ORBIT + ...
-                obj.controlParam.GAMMA * obj.controlParam.W_ORBIT * obj.controlParam.V_CONST * sigmoid_func(dotProd, obj.controlParam.EPS_SIGMOID);                     
+            wOut = Calc_Control_Input(obj.controlParam.W_ORBIT, curPose(3), dZC, ...
+                obj.controlParam.GAMMA * obj.controlParam.V_CONST, obj.controlParam.EPS_SIGMOID);                     
         end
         
 
@@ -1,61 +1,100 @@
-% disp("START")
-% [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(obj.curVMPose, obj.CVTCoord_2d, mVi, adjCoord_2d, vertex1_2d, vertex2_2d)
-% disp("NEXT")
-% [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(obj.curVMPose, obj.CVTCoord_2d, mVi, adjCoord_2d, vertex1_2d, vertex2_2d)
-% disp("END")
-% 
-% function [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2d, vertex1_2d, vertex2_2d)
-%     % Parse the struct
-%     thisCoord.x = thisCoord_2d(1);
-%     thisCoord.y = thisCoord_2d(2);
-%     adjCoord.x = adjCoord_2d(1);
-%     adjCoord.y = adjCoord_2d(2);
-%     thisCVT.x = thisCVT_2d(1);
-%     thisCVT.y = thisCVT_2d(2);
-%     vertex1.x = vertex1_2d(1);
-%     vertex1.y = vertex1_2d(2);
-%     vertex2.x = vertex2_2d(1);
-%     vertex2.y = vertex2_2d(2);
-% 
-%     %% Function definition for partial derivative
-%     % rho = @(x,y) 1;
-%     distanceZiZj = sqrt((thisCoord.x - adjCoord.x)^2 + (thisCoord.y - adjCoord.y)^2);
-%     dq__dZix_n = @(qX, ziX) (qX - ziX) / distanceZiZj; %        ((zjX - ziX)/2 + (qX - (qXY + zjX)/2)) / distanceZiZj; 
-%     dq__dZiy_n = @(qY, ziY) (qY - ziY) / distanceZiZj; %        ((zjY - ziY)/2 + (qY - (ziY + zjY)/2)) /distanceZiZj; 
-%     dq__dZjx_n = @(qX, zjX) (zjX - qX) / distanceZiZj; %        ((zjX - ziX)/2 - (qX - (ziX + zjX)/2)) /distanceZiZj; 
-%     dq__dZjy_n = @(qY, zjY) (zjY - qY) / distanceZiZj; %        ((zjY - ziY)/2 - (qY - (ziY + zjY)/2))/distanceZiZj; 
-%     
-%     
-%     
-%     %% Integration parameter: t: 0 -> 1
-%     XtoT = @(t) vertex1.x + (vertex2.x - vertex1.x)* t;
-%     YtoT = @(t) vertex1.y + (vertex2.y - vertex1.y)* t;
-%     % Factorization of dq = param * dt for line integration
-%     dqTodtParam = sqrt((vertex2.x - vertex1.x)^2 + (vertex2.y - vertex1.y)^2);  
-%     
-%     %% dCi_dzix
-%     dCi_dzix_secondTermInt = integral(@(t) dq__dZix_n(XtoT(t), thisCoord.x) * dqTodtParam , 0, 1);
-%     dCix_dzix = (integral(@(t) XtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.x) / mVi;
-%     dCiy_dzix = (integral(@(t) YtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.y) / mVi;
-%     
-%     %% dCi_dziy
-%     dCi_dziy_secondTermInt = integral(@(t) dq__dZiy_n(YtoT(t), thisCoord.y) * dqTodtParam , 0, 1);
-%     dCix_dziy = (integral(@(t) XtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.x) / mVi;
-%     dCiy_dziy = (integral(@(t) YtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.y) / mVi;
-%     
-%     %% dCi_dzjx
-%     dCi_dzjx_secondTermInt = integral(@(t) dq__dZjx_n(XtoT(t), adjCoord.x) * dqTodtParam , 0, 1 );
-%     dCix_dzjx = (integral(@(t) XtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.x) / mVi;
-%     dCiy_dzjx = (integral(@(t) YtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.y) / mVi;
-%     
-%     %% dCi_dzjy
-%     dCi_dzjy_secondTermInt = integral(@(t) dq__dZjy_n(YtoT(t), adjCoord.y) * dqTodtParam , 0, 1 );
-%     dCix_dzjy =  (integral(@(t) XtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.x) / mVi;
-%     dCiy_dzjy =  (integral(@(t) YtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.y) / mVi;
-%     
-%     %% Return
-%     dCi_dzi_AdjacentJ   = [ dCix_dzix, dCix_dziy; 
-%                             dCiy_dzix, dCiy_dziy];
-%     dCi_dzj             = [ dCix_dzjx, dCix_dzjy ;
-%                             dCiy_dzjx, dCiy_dzjy];   
-% end
\ No newline at end of file
+% Compare the closed-form partial derivatives of the CVT with the original
+% numerical line integration (integral), which is kept here as reference only.
+thisCoord_2d = [120.5; 240.25];
+thisCVT_2d = [150.75; 210.5];
+mVi = 3.6e4;
+adjCoord_2xN = [310.0, 90.5; 260.0, 410.75];
+vertex1_2xN = [215.0, 40.0; 180.5, 330.0];
+vertex2_2xN = [240.0, 200.0; 320.0, 318.0];
+nNeighbor = size(adjCoord_2xN, 2);
+
+% Relative tolerance with respect to the magnitude of the reference
+relTol = 1e-9;
+
+disp("START")
+[batch_dCi_dzi, batch_dCi_dzj] = Voronoi2D_calCVTPartialDerivative_Batch(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2xN, vertex1_2xN, vertex2_2xN);
+ref_dCi_dzi_2x2xN = zeros(2, 2, nNeighbor);
+ref_dCi_dzj_2x2xN = zeros(2, 2, nNeighbor);
+for i = 1: nNeighbor
+    [ref_dCi_dzi_2x2xN(:,:,i), ref_dCi_dzj_2x2xN(:,:,i)] = ComputePartialDerivativeCVTs(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2xN(:,i), vertex1_2xN(:,i), vertex2_2xN(:,i));
+    [dCi_dzi, dCi_dzj] = Voronoi2D_calCVTPartialDerivative(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2xN(:,i), vertex1_2xN(:,i), vertex2_2xN(:,i));
+    AssertClose(dCi_dzi, ref_dCi_dzi_2x2xN(:,:,i), relTol, sprintf("Closed form dCi_dzi of neighbor %d", i));
+    AssertClose(dCi_dzj, ref_dCi_dzj_2x2xN(:,:,i), relTol, sprintf("Closed form dCi_dzj of neighbor %d", i));
+    AssertClose(batch_dCi_dzi(:,:,i), ref_dCi_dzi_2x2xN(:,:,i), relTol, sprintf("Batch dCi_dzi of neighbor %d", i));
+    AssertClose(batch_dCi_dzj(:,:,i), ref_dCi_dzj_2x2xN(:,:,i), relTol, sprintf("Batch dCi_dzj of neighbor %d", i));
+end
+
+% The fused Lyapunov contribution must match the product with the reference 2x2 matrices
+w_2x1 = [0.75; -1.25];
+[fused_dCi_dzi_w, fused_dVi_dzj] = Calc_CVT_PD_L(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2xN, vertex1_2xN, vertex2_2xN, w_2x1);
+ref_dCi_dzi_w = zeros(2,1);
+ref_dVi_dzj = zeros(2, nNeighbor);
+for i = 1: nNeighbor
+    ref_dCi_dzi_w = ref_dCi_dzi_w + ref_dCi_dzi_2x2xN(:,:,i)' * w_2x1;
+    ref_dVi_dzj(:,i) = -ref_dCi_dzj_2x2xN(:,:,i)' * w_2x1;
+end
+AssertClose(fused_dCi_dzi_w, ref_dCi_dzi_w, relTol, "Fused dCi_dzi' * w");
+AssertClose(fused_dVi_dzj, ref_dVi_dzj, relTol, "Fused -dCi_dzj' * w");
+disp("END")
+
+function AssertClose(value, reference, relTol, name)
+    err = max(abs(value - reference), [], 'all');
+    tol = relTol * max(abs(reference), [], 'all');
+    assert(err <= tol, "%s deviates from the reference: err %e, tol %e", name, err, tol);
+end
+
+function [dCi_dzi_AdjacentJ, dCi_dzj] = ComputePartialDerivativeCVTs(thisCoord_2d, thisCVT_2d, mVi, adjCoord_2d, vertex1_2d, vertex2_2d)
+    % Parse the struct
+    thisCoord.x = thisCoord_2d(1);
+    thisCoord.y = thisCoord_2d(2);
+    adjCoord.x = adjCoord_2d(1);
+    adjCoord.y = adjCoord_2d(2);
+    thisCVT.x = thisCVT_2d(1);
+    thisCVT.y = thisCVT_2d(2);
+    vertex1.x = vertex1_2d(1);
+    vertex1.y = vertex1_2d(2);
+    vertex2.x = vertex2_2d(1);
+    vertex2.y = vertex2_2d(2);
+
+    %% Function definition for partial derivative
+    % rho = @(x,y) 1;
+    distanceZiZj = sqrt((thisCoord.x - adjCoord.x)^2 + (thisCoord.y - adjCoord.y)^2);
+    dq__dZix_n = @(qX, ziX) (qX - ziX) / distanceZiZj; %        ((zjX - ziX)/2 + (qX - (qXY + zjX)/2)) / distanceZiZj;
+    dq__dZiy_n = @(qY, ziY) (qY - ziY) / distanceZiZj; %        ((zjY - ziY)/2 + (qY - (ziY + zjY)/2)) /distanceZiZj;
+    dq__dZjx_n = @(qX, zjX) (zjX - qX) / distanceZiZj; %        ((zjX - ziX)/2 - (qX - (ziX + zjX)/2)) /distanceZiZj;
+    dq__dZjy_n = @(qY, zjY) (zjY - qY) / distanceZiZj; %        ((zjY - ziY)/2 - (qY - (ziY + zjY)/2))/distanceZiZj;
+
+
+
+    %% Integration parameter: t: 0 -> 1
+    XtoT = @(t) vertex1.x + (vertex2.x - vertex1.x)* t;
+    YtoT = @(t) vertex1.y + (vertex2.y - vertex1.y)* t;
+    % Factorization of dq = param * dt for line integration
+    dqTodtParam = sqrt((vertex2.x - vertex1.x)^2 + (vertex2.y - vertex1.y)^2);
+
+    %% dCi_dzix
+    dCi_dzix_secondTermInt = integral(@(t) dq__dZix_n(XtoT(t), thisCoord.x) * dqTodtParam , 0, 1);
+    dCix_dzix = (integral(@(t) XtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.x) / mVi;
+    dCiy_dzix = (integral(@(t) YtoT(t) .* dq__dZix_n(XtoT(t), thisCoord.x) .* dqTodtParam, 0, 1) - dCi_dzix_secondTermInt * thisCVT.y) / mVi;
+
+    %% dCi_dziy
+    dCi_dziy_secondTermInt = integral(@(t) dq__dZiy_n(YtoT(t), thisCoord.y) * dqTodtParam , 0, 1);
+    dCix_dziy = (integral(@(t) XtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.x) / mVi;
+    dCiy_dziy = (integral(@(t) YtoT(t) .* dq__dZiy_n(YtoT(t), thisCoord.y) .* dqTodtParam, 0, 1) - dCi_dziy_secondTermInt * thisCVT.y) / mVi;
+
+    %% dCi_dzjx
+    dCi_dzjx_secondTermInt = integral(@(t) dq__dZjx_n(XtoT(t), adjCoord.x) * dqTodtParam , 0, 1 );
+    dCix_dzjx = (integral(@(t) XtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.x) / mVi;
+    dCiy_dzjx = (integral(@(t) YtoT(t) .* dq__dZjx_n(XtoT(t), adjCoord.x) .* dqTodtParam, 0, 1) - dCi_dzjx_secondTermInt * thisCVT.y) / mVi;
+
+    %% dCi_dzjy
+    dCi_dzjy_secondTermInt = integral(@(t) dq__dZjy_n(YtoT(t), adjCoord.y) * dqTodtParam , 0, 1 );
+    dCix_dzjy =  (integral(@(t) XtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.x) / mVi;
+    dCiy_dzjy =  (integral(@(t) YtoT(t) .* dq__dZjy_n(YtoT(t), adjCoord.y) .* dqTodtParam, 0, 1) - dCi_dzjy_secondTermInt * thisCVT.y) / mVi;
+
+    %% Return
+    dCi_dzi_AdjacentJ   = [ dCix_dzix, dCix_dziy;
+                            dCiy_dzix, dCiy_dziy];
+    dCi_dzj             = [ dCix_dzjx, dCix_dzjy ;
+                            dCiy_dzjx, dCiy_dzjy];
+end
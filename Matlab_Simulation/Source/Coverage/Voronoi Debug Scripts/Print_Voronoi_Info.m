@@ -4,7 +4,10 @@ function Print_Voronoi_Info(InfoStruct, AgentID)
     fprintf("\n INFO Agent %d ***********************\n", AgentID);
     fprintf("Coord: [%.8f, %.8f] \n", thisAgentInfo.Coord.x, thisAgentInfo.Coord.y);
     fprintf("CVT: [%.8f, %.8f] \n", thisAgentInfo.VoronoiInfo.CVTCoord.x, thisAgentInfo.VoronoiInfo.CVTCoord.y);
-    fprintf("PartialCVT dC%d_dVM%d: [%.8f, %.8f ; %.8f, %.8f] \n", AgentID, AgentID, thisAgentInfo.VoronoiInfo.partialCVT.dCx_dVMx, thisAgentInfo.VoronoiInfo.partialCVT.dCx_dVMy, thisAgentInfo.VoronoiInfo.partialCVT.dCy_dVMx, thisAgentInfo.VoronoiInfo.partialCVT.dCy_dVMy);
+    % The partial derivatives of the CVTs are skipped when ComputeVoronoiProperty is called with computePartialCVT = false
+    if(isfield(thisAgentInfo.VoronoiInfo, 'partialCVT'))
+        fprintf("PartialCVT dC%d_dVM%d: [%.8f, %.8f ; %.8f, %.8f] \n", AgentID, AgentID, thisAgentInfo.VoronoiInfo.partialCVT.dC_dVM');
+    end
     fprintf("Lyapunov V%d: %.9f \n", AgentID, thisAgentInfo.LyapunovState.V);
     fprintf("Partial Lyapunov dV%d_dz%d: [%.5f, %.5f] \n", AgentID, AgentID, thisAgentInfo.LyapunovState.dV_dVM.x, thisAgentInfo.LyapunovState.dV_dVM.y);
     fprintf("Partiotion vertexes: [");
@@ -21,7 +24,9 @@ function Print_Voronoi_Info(InfoStruct, AgentID)
             fprintf("Coord: [%.8f, %.8f]\n", friendInfo.Coord.x, friendInfo.Coord.y);
             fprintf("CVT: [%.8f, %.8f] \n" , friendInfo.VoronoiInfo.CVTCoord.x, friendInfo.VoronoiInfo.CVTCoord.y);
             fprintf("Common Vertexex: V1 [%.8f, %.8f] V2 [%.8f, %.8f]\n", friendInfo.VoronoiInfo.CommonVertex.Vertex1.x, friendInfo.VoronoiInfo.CommonVertex.Vertex1.y, friendInfo.VoronoiInfo.CommonVertex.Vertex2.x, friendInfo.VoronoiInfo.CommonVertex.Vertex2.y);
-            fprintf("PartialCVT dC%d_dVM%d: [%.8f, %.8f ; %.8f, %.8f] \n",AgentID, friendID, friendInfo.VoronoiInfo.partialCVT.dCx_dVMFriend_x, friendInfo.VoronoiInfo.partialCVT.dCx_dVMFriend_y, friendInfo.VoronoiInfo.partialCVT.dCy_dVMFriend_x, friendInfo.VoronoiInfo.partialCVT.dCy_dVMFriend_y);
+            if(isfield(friendInfo.VoronoiInfo, 'partialCVT'))
+                fprintf("PartialCVT dC%d_dVM%d: [%.8f, %.8f ; %.8f, %.8f] \n",AgentID, friendID, friendInfo.VoronoiInfo.partialCVT.dC_dVMFriend');
+            end
             fprintf("Partial Lyapunov dV%d_dz%d: [%.5f, %.5f]", AgentID, friendID, ...
                         InfoStruct.AgentReport(AgentID).FriendAgentInfo(friendID).LyapunovState.dV_dVMFriend.x,... 
                         InfoStruct.AgentReport(AgentID).FriendAgentInfo(friendID).LyapunovState.dV_dVMFriend.y);
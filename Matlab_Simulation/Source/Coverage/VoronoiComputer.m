@@ -4,8 +4,8 @@ classdef VoronoiComputer < handle
     
     properties
         ID
-        GeneratorCoord_2d = zeros(2,1)
-        CVTCoord_2d = zeros(2,1)
+        GeneratorCoord_2d
+        CVTCoord_2d
         % Save the last computed result to evaluate the calculation
         prev_CVTCoord_2d
         dCkdzk
@@ -19,6 +19,10 @@ classdef VoronoiComputer < handle
     methods
         function obj = VoronoiComputer(ID)
             obj.ID = ID;
+            % Each instance owns its state, initialized with the final shapes
+            obj.GeneratorCoord_2d = zeros(2,1);
+            obj.CVTCoord_2d = zeros(2,1);
+            obj.dCkdzk = zeros(2,2);
         end
         
         function [CVT, dCk_dzi_For_Neighbor] = computePartialDerivativeCVT(obj, z_2d, i_received_VoronoiPartitionInfo)
@@ -26,37 +30,34 @@ classdef VoronoiComputer < handle
              obj.prev_CVTCoord_2d = obj.CVTCoord_2d;
              obj.prev_dCkdzk = obj.dCkdzk;
              format long;
-             [~, Vertex2D_List, neighborInfoList] = i_received_VoronoiPartitionInfo.getValue();
+             [~, Vertex2D_List, ~] = i_received_VoronoiPartitionInfo.getValue();
              % Initally no vertex passed 
              if(~isempty(Vertex2D_List))
                  
                 [obj.CVTCoord_2d] = Voronoi2D_calcCVT(Vertex2D_List);
                 CVT = obj.CVTCoord_2d;
                
-                nNeighbor = numel(neighborInfoList);
-                dCk_dzk = zeros(2,2);
-                %% Iterate to obtain the aggregated dCi_dzi
+                %% Compute the partial derivatives of all neighbors at once from the packed neighbor information
+                [neighborID_List, neighbor_vm_2xN, v1_2xN, v2_2xN] = i_received_VoronoiPartitionInfo.getNeighborArrays();
+                nNeighbor = numel(neighborID_List);
                 mVi = Voronoi2D_calcPartitionMass(Vertex2D_List);
+                [dCk_dzk_Neighbor, dCk_dzi] = Voronoi2D_calCVTPartialDerivative_Batch(...
+                                                    obj.GeneratorCoord_2d, ...
+                                                    obj.CVTCoord_2d, ...
+                                                    mVi, ... 
+                                                    neighbor_vm_2xN, ... 
+                                                    v1_2xN, ...
+                                                    v2_2xN);
+                % Accumulate to get the own partial derivative
+                dCk_dzk = sum(dCk_dzk_Neighbor, 3);
+                
                 dCk_dzi_For_Neighbor = Struct_Neighbor_CVT_PD.empty(nNeighbor, 0);
                 for i = 1: nNeighbor
-                    % Compute the partial derivative related to each
-                    % adjacent agent
-                    [neighborID, neighbor_vm_2d, v1_2d, v2_2d] = neighborInfoList{i}.getNeighborInfo();
-                    
-                    [dCk_dzk_Neighbor_i, dCk_dzi] = Voronoi2D_calCVTPartialDerivative(...
-                                                        obj.GeneratorCoord_2d, ...
-                                                        obj.CVTCoord_2d, ...
-                                                        mVi, ... 
-                                                        neighbor_vm_2d, ... 
-                                                        v1_2d, ...
-                                                        v2_2d);
                     % Result for an adjacent agent to be published
-                    dCk_dzi_For_Neighbor(i) = Struct_Neighbor_CVT_PD(obj.ID, neighborID, ...
+                    dCk_dzi_For_Neighbor(i) = Struct_Neighbor_CVT_PD(obj.ID, neighborID_List(i), ...
                                                                        obj.GeneratorCoord_2d, ...
                                                                        obj.CVTCoord_2d, ...
-                                                                       dCk_dzi); %% Create a report with neighbor ID to publish             
-                    % Accumulate to get the own partial derivative
-                    dCk_dzk = dCk_dzk + dCk_dzk_Neighbor_i;
+                                                                       dCk_dzi(:,:,i)); %% Create a report with neighbor ID to publish             
                 end
                 obj.dCkdzk = dCk_dzk;
                 
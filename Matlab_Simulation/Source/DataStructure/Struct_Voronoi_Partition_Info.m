@@ -14,6 +14,9 @@
 % - @[NeighborInfoList]: The array of structure "Struct_Neighbor_Voronoi_Partition", each includes the 
 %   coordinate of the Voronoi neighbor agent with a specific ID (Struct_Neighbor_Voronoi_Partition.ReceiverID) and the common vertexes
 %   coordinates of these two agents
+% - @[NeighborID_List, NeighborCoord_2xN, CommonVertex1_2xN, CommonVertex2_2xN]: The same neighbor
+%   information packed as arrays, one column per neighbor, so that the partial derivatives of all
+%   neighbors are computed at once without accessing each object
 classdef Struct_Voronoi_Partition_Info < Report_Base
     properties (Constant, Access = private)
        NAME = "Struct_Voronoi_Partition_Info" 
@@ -23,6 +26,11 @@ classdef Struct_Voronoi_Partition_Info < Report_Base
         PartitionOwnerID
         Vertex2D_List
         NeighborInfoList
+        
+        NeighborID_List
+        NeighborCoord_2xN
+        CommonVertex1_2xN
+        CommonVertex2_2xN
     end
     
     methods
@@ -33,6 +41,20 @@ classdef Struct_Voronoi_Partition_Info < Report_Base
             obj.PartitionOwnerID = PartitionOwnerID;
             obj.Vertex2D_List = vertex;
             obj.NeighborInfoList = neighborInfo;
+            
+            %% Pack the neighbor information once when the report is created
+            nNeighbor = numel(neighborInfo);
+            idList = zeros(1, nNeighbor);
+            coord_2xN = zeros(2, nNeighbor);
+            v1_2xN = zeros(2, nNeighbor);
+            v2_2xN = zeros(2, nNeighbor);
+            for i = 1: nNeighbor
+                [idList(i), coord_2xN(:,i), v1_2xN(:,i), v2_2xN(:,i)] = neighborInfo{i}.getNeighborInfo();
+            end
+            obj.NeighborID_List = idList;
+            obj.NeighborCoord_2xN = coord_2xN;
+            obj.CommonVertex1_2xN = v1_2xN;
+            obj.CommonVertex2_2xN = v2_2xN;
         end
         
         function [o_ownerID, o_Vertex2D_List, o_NeighborInfoList] = getValue(obj)
@@ -40,6 +62,13 @@ classdef Struct_Voronoi_Partition_Info < Report_Base
             o_Vertex2D_List = obj.Vertex2D_List; 
             o_NeighborInfoList = obj.NeighborInfoList;
         end
+        
+        function [o_NeighborID_List, o_NeighborCoord_2xN, o_CommonVertex1_2xN, o_CommonVertex2_2xN] = getNeighborArrays(obj)
+            o_NeighborID_List = obj.NeighborID_List;
+            o_NeighborCoord_2xN = obj.NeighborCoord_2xN;
+            o_CommonVertex1_2xN = obj.CommonVertex1_2xN;
+            o_CommonVertex2_2xN = obj.CommonVertex2_2xN;
+        end
     end
     
     methods (Access = protected)
@@ -1,11 +1,11 @@
 classdef ControlParameter < handle
      properties
-        V_CONST = 40;
-        W_ORBIT = 0.8;
-        Q2x2 = 5 * eye(2);
-        GAMMA = 3;
-        EPS_SIGMOID = 5
-        W_LIMIT = 1.6;
+        V_CONST         % Constant heading velocity
+        W_ORBIT         % Orbital (desired angular) velocity
+        Q2x2            % Q Norm _ Positive definit
+        GAMMA           % Control Gain
+        EPS_SIGMOID     % Epsilon of the sigmoid function
+        W_LIMIT         % Saturation angular velocity
      end
     
     methods